@@ -3,23 +3,25 @@ dataset_module.py
 
 This module handles loading and preprocessing the stroke dataset.
 It reads the data from a CSV file, cleans it, and converts values to appropriate data types.
+Records are stored column-wise (one list per column) so queries can scan a
+single feature without walking a dict per row. On request, the parsed columns
+are cached in a pickle file beside the CSV so later runs can skip re-parsing it.
 """
 
+import csv
+import os
+import pickle
 
-def _convert_to_appropriate_type(value_str):
-    """
-    Helper function to convert a string value to its correct data type:
-    - Returns None for missing or 'N/A' values.
-    - Preserves 'Unknown' as a string.
-    - Attempts to convert to int, then float; otherwise returns as string.
-    """
-    value_str = value_str.strip()
+CACHE_SUFFIX = '.cache'
+# Bumped whenever parsing changes so caches written by older code are ignored
+CACHE_FORMAT = 5
+
+# Raw cell values that are not data: missing markers map to None, 'Unknown' is kept
+_SENTINELS = {'N/A': None, '': None, 'Unknown': 'Unknown'}
 
-    if value_str in ('N/A', ''):
-        return None
-    if value_str == 'Unknown':
-        return 'Unknown'
 
+def _convert_value(value_str):
+    """Converts one raw (already stripped, non-sentinel) string to int, then float, else keeps it."""
     try:
         return int(value_str)
     except ValueError:
@@ -29,48 +31,125 @@ def _convert_to_appropriate_type(value_str):
             return value_str
 
 
-def load_data(filepath):
+def _convert_column(values):
+    """
+    Helper function to convert a whole column of raw strings to its data type:
+    - Returns None for missing or 'N/A' values.
+    - Preserves 'Unknown' as a string.
+    - Converts every other value to int, then float; otherwise keeps it as a string.
+
+    When all the non-missing values share one numeric type, that type is
+    applied to the whole column with map(), instead of trying int() then
+    float() on every cell. Other columns are converted one distinct value at a
+    time, so a stray text cell in a numeric column only affects that cell.
+    Text columns are dictionary-encoded on the way: every repeated category
+    (e.g. 'Urban', 'Never smoked') becomes one shared string object, so the
+    column stores references to a handful of strings instead of a separate
+    copy per record, and equality checks on the same category short-circuit
+    on identity.
+    """
+    present = None
+    for convert in (int, float):
+        try:
+            return list(map(convert, values))
+        except ValueError:
+            pass
+        if present is None:
+            present = [v for v in values if v not in _SENTINELS]
+        try:
+            converted = iter(list(map(convert, present)))
+        except ValueError:
+            continue
+        return [_SENTINELS[v] if v in _SENTINELS else next(converted) for v in values]
+    categories = dict(_SENTINELS)
+    return [categories[v] if v in categories else categories.setdefault(v, _convert_value(v)) for v in values]
+
+
+def _file_stamp(filepath):
+    """Returns the cache format, modification time and size line used to detect a stale cache."""
+    stat = os.stat(filepath)
+    return f"{CACHE_FORMAT} {stat.st_mtime_ns} {stat.st_size}\n".encode('ascii')
+
+
+def _read_cache(filepath):
+    """
+    Returns the cached (data, header) for a CSV file, or None when there is
+    no usable cache or the CSV has changed since it was written.
+
+    The stamp is a plain text first line, checked before anything is unpickled.
+    """
+    try:
+        with open(filepath + CACHE_SUFFIX, 'rb') as cache_file:
+            if cache_file.readline() != _file_stamp(filepath):
+                return None
+            data, header = pickle.load(cache_file)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return None
+    return data, header
+
+
+def _write_cache(filepath, data, header):
+    """Stores the parsed columns next to the CSV; failures only cost the speed-up."""
+    try:
+        with open(filepath + CACHE_SUFFIX, 'wb') as cache_file:
+            cache_file.write(_file_stamp(filepath))
+            pickle.dump((data, header), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def load_data(filepath, use_cache=False):
     """
     Loads and parses the stroke dataset from a CSV file.
 
     Args:
         filepath (str): Path to the CSV file.
+        use_cache (bool): Reuse (and refresh) the parsed-column cache stored
+            at filepath + CACHE_SUFFIX. Only enable it for trusted directories,
+            since the cache is a pickle. Defaults to False.
 
     Returns:
         tuple:
-            - data (list of dict): List of records with properly typed values.
+            - data (dict of str -> list): Column name mapped to the list of
+              properly typed values for that column, one entry per record.
             - header (list of str): List of column names.
 
     Raises:
         FileNotFoundError: If the file does not exist.
         Exception: For any other errors during file reading or parsing.
     """
-    data = []
+    data = {}
     header = []
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
+        if use_cache:
+            cached = _read_cache(filepath)
+            if cached is not None:
+                return cached
+
+        with open(filepath, 'r', encoding='utf-8', newline='') as file:
+            # csv.reader splits (and unquotes) fields in C
+            reader = csv.reader(file)
+
             # Read the first line to get column headers
-            header_line = file.readline()
-            if not header_line:
-                return [], []
+            header_row = next(reader, None)
+            if not header_row:
+                return {}, []
 
-            header = [h.strip() for h in header_line.strip().split(',')]
+            header = [h.strip() for h in header_row]
             expected_columns = len(header)
+            rows = []
 
-            # Read and process each subsequent line
-            for line in file:
-                if not line.strip():
-                    continue  # Skip empty lines
+            # Collect each subsequent row; conversion happens per column below
+            for row in reader:
+                if len(row) == expected_columns:
+                    rows.append(list(map(str.strip, row)))
 
-                values = [v.strip() for v in line.strip().split(',')]
+            columns = zip(*rows) if rows else ([] for _ in header)
+            data = {name: _convert_column(column) for name, column in zip(header, columns)}
 
-                if len(values) == expected_columns:
-                    record = {
-                        header[i]: _convert_to_appropriate_type(values[i])
-                        for i in range(expected_columns)
-                    }
-                    data.append(record)
+        if use_cache:
+            _write_cache(filepath, data, header)
 
     except FileNotFoundError:
         raise FileNotFoundError(f"Dataset file not found at: {filepath}")
@@ -2,34 +2,111 @@
 Module for querying the loaded stroke dataset.
 Provides statistical analysis functions based on assignment requirements,
 using header names from the provided preview.
+
+The dataset is held column-wise (column name -> list of values), so filters
+work on row indices and only touch the columns a query actually needs.
 """
 
+import csv
 import math
 import os
+import statistics
 from collections import Counter
+from itertools import chain, repeat
+from operator import mul, sub
+
+
+# Columns the fixed queries (i - ix, xi) filter on; _group_rows buckets by these.
+GROUP_COLUMNS = ('Hypertension', 'Heart Disease', 'Stroke Occurrence',
+                 'Smoking Status', 'Gender', 'Residence Type')
 
 
 # --- Helper Functions ---
 
-def _filter_data(data, conditions):
-    """Filter dataset records based on given conditions."""
+def _row_count(data):
+    """Return the number of records held in the column store."""
+    return len(next(iter(data.values()))) if data else 0
+
+
+def _group_rows(data, keys=GROUP_COLUMNS):
+    """Bucket row indices by their values for the given columns in one scan."""
+    n = _row_count(data)
+    columns = [data[key] if key in data else repeat(None, n) for key in keys]
+    buckets = {}
+    for i, bucket_key in enumerate(zip(*columns)):
+        bucket = buckets.get(bucket_key)
+        if bucket is None:
+            buckets[bucket_key] = [i]
+        else:
+            bucket.append(i)
+    return keys, buckets
+
+
+def _filter_groups(groups, conditions):
+    """Return matching row indices by merging the buckets of a _group_rows result."""
+    keys, buckets = groups
+    positions = [(keys.index(key), value) for key, value in conditions.items()]
+    matching = [rows for bucket_key, rows in buckets.items()
+                if all(bucket_key[pos] == value for pos, value in positions)]
+    # Buckets are already in row order, so this sort only merges sorted runs
+    return sorted(chain.from_iterable(matching))
+
+
+def _filter_data(data, conditions, groups=None):
+    """Return the indices of records matching all given conditions."""
     if not conditions:
-        return data
-    filtered = []
-    for record in data:
-        if all(record.get(key) == value for key, value in conditions.items()):
-            filtered.append(record)
-    return filtered
-
-
-def _get_numeric_values(data, feature, conditions=None):
-    """Extract numeric values for a feature, optionally filtered."""
-    values = []
-    for record in _filter_data(data, conditions) if conditions else data:
-        value = record.get(feature)
+        return range(_row_count(data))
+    if groups is not None and all(key in groups[0] for key in conditions):
+        return _filter_groups(groups, conditions)
+    # Narrowing the index list one condition at a time keeps each comparison in a
+    # tight comprehension; matching zip()-ed row tuples or generating a filter per
+    # condition set both measured about 2x slower on the 172k-row dataset.
+    (first_key, first_value), *rest = conditions.items()
+    column = data.get(first_key, [])
+    indices = [i for i, value in enumerate(column) if value == first_value]
+    for key, value in rest:
+        column = data.get(key)
+        if column is None:
+            return []
+        indices = [i for i in indices if column[i] == value]
+    return indices
+
+
+def _select_rows(data, indices):
+    """Yield one tuple of column values per row index."""
+    return zip(*(map(column.__getitem__, indices) for column in data.values()))
+
+
+def _select_records(data, indices):
+    """Build record dicts (one per row index) for returning or saving rows."""
+    names = list(data.keys())
+    return [dict(zip(names, row)) for row in _select_rows(data, indices)]
+
+
+def _get_numeric_values(data, feature, indices=None):
+    """Extract numeric values for a feature, optionally restricted to the given row indices."""
+    column = data.get(feature, [])
+    if indices is not None:
+        column = map(column.__getitem__, indices)
+    return [value for value in column if isinstance(value, (int, float))]
+
+
+def _group_numeric_values(data, feature, keys, conditions=None, groups=None):
+    """Split a numeric feature by the values of `keys` in one pass, optionally filtered."""
+    indices = _filter_data(data, conditions, groups)
+    # Missing columns read as all-None, like in _group_rows (a list, since rows are picked by index)
+    missing = [None] * _row_count(data)
+    columns = [data.get(feature) or missing] + [data.get(key) or missing for key in keys]
+    grouped = {}
+    for row in zip(*(map(column.__getitem__, indices) for column in columns)):
+        value = row[0]
         if isinstance(value, (int, float)):
-            values.append(value)
-    return values
+            bucket = grouped.get(row[1:])
+            if bucket is None:
+                grouped[row[1:]] = [value]
+            else:
+                bucket.append(value)
+    return grouped
 
 
 def _calculate_mean(numbers):
@@ -37,52 +114,94 @@ def _calculate_mean(numbers):
     return round(sum(numbers) / len(numbers), 2) if numbers else None
 
 
-def _calculate_median(numbers):
-    """Calculate median of a list of numbers."""
+def _calculate_median(numbers, presorted=False):
+    """Calculate median of a list of numbers (pass presorted=True to skip sorting)."""
     if not numbers:
         return None
-    numbers = sorted(numbers)
+    if not presorted:
+        return round(statistics.median(numbers), 2)
     mid = len(numbers) // 2
     return round((numbers[mid - 1] + numbers[mid]) / 2, 2) if len(numbers) % 2 == 0 else round(numbers[mid], 2)
 
 
+def _count_values(items):
+    """Count occurrences of each value in one C-level pass, ignoring missing (None/'') values."""
+    counts = Counter(items)
+    for missing in [item for item in counts if item is None or item == '']:
+        del counts[missing]
+    return counts
+
+
 def _calculate_mode(items):
     """Calculate mode(s) of a list."""
-    valid_items = [item for item in items if item is not None]
-    if not valid_items:
+    counts = _count_values(items)
+    if not counts:
         return []
-    counts = Counter(valid_items)
     max_count = max(counts.values())
-    return sorted([item for item, count in counts.items() if count == max_count])
+    return sorted(item for item, count in counts.items() if count == max_count)
 
 
 def _calculate_std_dev(numbers, mean_val=None):
     """Calculate sample standard deviation."""
     if not numbers or len(numbers) < 2:
         return None
-    mean_val = mean_val if mean_val is not None else _calculate_mean(numbers)
-    variance = sum((x - mean_val) ** 2 for x in numbers) / (len(numbers) - 1)
+    mean_val = mean_val if mean_val is not None else sum(numbers) / len(numbers)
+    # map() keeps the per-element subtraction and squaring in C
+    deviations = list(map(sub, numbers, repeat(mean_val)))
+    variance = sum(map(mul, deviations, deviations)) / (len(numbers) - 1)
     return round(math.sqrt(variance), 2)
 
 
-def _calculate_percentile(numbers, percentile):
-    """Calculate a specific percentile."""
-    if not numbers or not (0 <= percentile <= 100):
-        return None
-    numbers = sorted(numbers)
-    k = (len(numbers) - 1) * (percentile / 100)
-    f, c = math.floor(k), math.ceil(k)
-    return round(numbers[int(k)], 2) if f == c else round(numbers[f] * (c - k) + numbers[c] * (k - f), 2)
+def _calculate_percentiles(numbers, percentiles, presorted=False):
+    """Calculate several percentiles from one sort (pass presorted=True to skip sorting)."""
+    if not numbers:
+        return [None] * len(percentiles)
+    if not presorted:
+        numbers = sorted(numbers)
+    results = []
+    for percentile in percentiles:
+        if not (0 <= percentile <= 100):
+            results.append(None)
+            continue
+        k = (len(numbers) - 1) * (percentile / 100)
+        f, c = math.floor(k), math.ceil(k)
+        results.append(round(numbers[int(k)], 2) if f == c else round(numbers[f] * (c - k) + numbers[c] * (k - f), 2))
+    return results
+
+
+def _summary_statistics(numbers):
+    """
+    Calculate count, mean, median, mode, std_dev, min, quartiles and max.
+
+    The list is sorted in place once and every order statistic is read from
+    it by index; the mean is computed once and reused for the std_dev.
+    """
+    if not numbers:
+        return {'count': 0, 'mean': None, 'median': None, 'mode': [], 'std_dev': None,
+                'min': None, '25%': None, '75%': None, 'max': None}
+    numbers.sort()
+    mean_val = sum(numbers) / len(numbers)
+    lower_quartile, upper_quartile = _calculate_percentiles(numbers, (25, 75), presorted=True)
+    return {
+        'count': len(numbers),
+        'mean': round(mean_val, 2),
+        'median': _calculate_median(numbers, presorted=True),
+        'mode': _calculate_mode(numbers),
+        'std_dev': _calculate_std_dev(numbers, mean_val),
+        'min': round(numbers[0], 2),
+        '25%': lower_quartile,
+        '75%': upper_quartile,
+        'max': round(numbers[-1], 2)
+    }
 
 
-def _format_csv_value(value):
-    """Format a value for CSV output."""
-    if value is None:
-        return ''
-    value_str = str(value)
-    if any(c in value_str for c in ',\"\n'):
-        return f'"{value_str.replace("\"", "\"\"")}"'
-    return value_str
+def _format_summary_value(value):
+    """Flatten a nested dict/list result value into a single CSV cell."""
+    if isinstance(value, dict):
+        return ', '.join(f"{k}: {v}" for k, v in value.items())
+    if isinstance(value, list):
+        return str(value)
+    return value
 
 
 def save_results_csv(data_to_save, filename, headers=None):
@@ -90,23 +209,21 @@ def save_results_csv(data_to_save, filename, headers=None):
     if not filename.lower().endswith('.csv'):
         filename += '.csv'
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
+        # csv.writer quotes and joins fields in C; a 1 MiB buffer batches the writes
+        with open(filename, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f, lineterminator='\n')
             if isinstance(data_to_save, dict):
-                f.write("Metric,Value\n")
-                for key, value in data_to_save.items():
-                    if isinstance(value, (dict, list)):
-                        value = ', '.join(f"{k}: {v}" for k, v in value.items()) if isinstance(value, dict) else str(value)
-                    f.write(f"{_format_csv_value(key)},{_format_csv_value(value)}\n")
+                writer.writerow(("Metric", "Value"))
+                writer.writerows((key, _format_summary_value(value)) for key, value in data_to_save.items())
             elif isinstance(data_to_save, list) and data_to_save:
                 if headers is None:
                     if isinstance(data_to_save[0], dict):
                         headers = list(data_to_save[0].keys())
                     else:
                         raise ValueError("Headers must be provided for non-dict data.")
-                f.write(','.join(_format_csv_value(h) for h in headers) + '\n')
-                for row in data_to_save:
-                    row_values = [_format_csv_value(row.get(header) if isinstance(row, dict) else row[i]) for i, header in enumerate(headers)]
-                    f.write(','.join(row_values) + '\n')
+                writer.writerow(headers)
+                writer.writerows([row.get(header) for header in headers] if isinstance(row, dict) else row
+                                 for row in data_to_save)
             else:
                 f.write(str(data_to_save) + '\n')
         print(f"Results successfully saved to {os.path.abspath(filename)}")
@@ -116,12 +233,40 @@ def save_results_csv(data_to_save, filename, headers=None):
 
 # --- Query Functions (i - xi) ---
 
-def query_smokers_hypertension_stroke(data):
+# CSV file each of the queries i - ix and xi saves its result to, keyed by function name
+QUERY_RESULT_FILES = {
+    'query_smokers_hypertension_stroke': "smokers_hypertension_stroke.csv",
+    'query_heart_disease_stroke': "heart_disease_stroke_stats.csv",
+    'query_hypertension_gender_stroke': "hypertension_gender_stroke.csv",
+    'query_smoking_stroke': "smoking_stroke.csv",
+    'query_residence_stroke': "residence_stroke.csv",
+    'query_dietary_habits_stroke': "dietary_habits_stroke.csv",
+    'query_hypertension_stroke_patients': "hypertension_stroke_patients.csv",
+    'query_hypertension_stroke_comparison': "hypertension_stroke_comparison.csv",
+    'query_heart_disease_stroke_patients': "heart_disease_stroke_patients.csv",
+    'query_average_sleep_hours_stroke': "average_sleep_hours_stroke.csv",
+}
+
+
+def save_query_result(query_name, result, data):
+    """Save the result of one of the queries i - ix and xi to that query's CSV file."""
+    filename = QUERY_RESULT_FILES[query_name]
+    if query_name == 'query_hypertension_stroke_comparison':
+        # Both patient groups go into one file, labelled by a trailing Group column
+        rows = chain(([*record.values(), 'Stroke'] for record in result['hypertension_led_to_stroke']),
+                     ([*record.values(), 'No Stroke'] for record in result['hypertension_did_not_lead_to_stroke']))
+        save_results_csv(list(rows), filename, headers=list(data.keys()) + ['Group'])
+    else:
+        save_results_csv(result, filename)
+
+
+def query_smokers_hypertension_stroke(data, groups=None, save=True):
     """i. Age statistics for smokers with hypertension who had a stroke."""
     smoking_statuses = ['Formerly smoked', 'smokes']
     ages = []
     for status in smoking_statuses:
-        ages.extend(_get_numeric_values(data, 'Age', {'Hypertension': 1, 'Stroke Occurrence': 1, 'Smoking Status': status}))
+        rows = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 1, 'Smoking Status': status}, groups)
+        ages.extend(_get_numeric_values(data, 'Age', rows))
     if not ages:
         result = {"message": "No data found for smokers with hypertension who had a stroke"}
     else:
@@ -132,15 +277,17 @@ def query_smokers_hypertension_stroke(data):
             'median_age': _calculate_median(ages),
             'modal_age': _calculate_mode(ages)
         }
-    save_results_csv(result, "smokers_hypertension_stroke.csv")
+    if save:
+        save_query_result('query_smokers_hypertension_stroke', result, data)
     return result
 
 
-def query_heart_disease_stroke(data):
+def query_heart_disease_stroke(data, groups=None, save=True):
     """ii. Age and glucose statistics for patients with heart disease who had a stroke."""
     conditions = {'Heart Disease': 1, 'Stroke Occurrence': 1}
-    ages = _get_numeric_values(data, 'Age', conditions)
-    glucose_levels = _get_numeric_values(data, 'Average Glucose Level', conditions)
+    rows = _filter_data(data, conditions, groups)
+    ages = _get_numeric_values(data, 'Age', rows)
+    glucose_levels = _get_numeric_values(data, 'Average Glucose Level', rows)
     if not ages:
         result = {"message": "No data found for patients with heart disease who had a stroke"}
     else:
@@ -152,18 +299,20 @@ def query_heart_disease_stroke(data):
             'modal_age': _calculate_mode(ages),
             'average_glucose_level': _calculate_mean(glucose_levels)
         }
-    save_results_csv(result, "heart_disease_stroke_stats.csv")
+    if save:
+        save_query_result('query_heart_disease_stroke', result, data)
     return result
 
 
-def query_hypertension_gender_stroke(data):
+def query_hypertension_gender_stroke(data, groups=None, save=True):
     """iii. Age stats by gender for hypertension+stroke vs hypertension+no stroke."""
-    genders = {r.get('Gender') for r in data if r.get('Gender') and r.get('Gender') != 'Other'}
+    genders = {g for g in data.get('Gender', []) if g and g != 'Other'}
+    grouped_ages = _group_numeric_values(data, 'Age', ('Gender', 'Stroke Occurrence'),
+                                         {'Hypertension': 1}, groups)
     results = {}
     for gender in genders:
         for stroke_status, label in [(1, 'Stroke'), (0, 'NoStroke')]:
-            conditions = {'Hypertension': 1, 'Stroke Occurrence': stroke_status, 'Gender': gender}
-            ages = _get_numeric_values(data, 'Age', conditions)
+            ages = grouped_ages.get((gender, stroke_status), [])
             key = f"{gender}_Hypertension_{label}"
             results[key] = {
                 'count': len(ages),
@@ -171,18 +320,19 @@ def query_hypertension_gender_stroke(data):
                 'median_age': _calculate_median(ages),
                 'modal_age': _calculate_mode(ages)
             } if ages else {'count': 0, 'message': 'No data'}
-    save_results_csv(results, "hypertension_gender_stroke.csv")
+    if save:
+        save_query_result('query_hypertension_gender_stroke', results, data)
     return results
 
 
-def query_smoking_stroke(data):
+def query_smoking_stroke(data, groups=None, save=True):
     """iv. Age stats for smoking habit -> stroke vs no stroke."""
-    smoking_statuses = {r.get('Smoking Status') for r in data if r.get('Smoking Status')}
+    smoking_statuses = {s for s in data.get('Smoking Status', []) if s}
+    grouped_ages = _group_numeric_values(data, 'Age', ('Smoking Status', 'Stroke Occurrence'))
     results = {}
     for status in smoking_statuses:
         for stroke_status, label in [(1, 'Stroke'), (0, 'NoStroke')]:
-            conditions = {'Smoking Status': status, 'Stroke Occurrence': stroke_status}
-            ages = _get_numeric_values(data, 'Age', conditions)
+            ages = grouped_ages.get((status, stroke_status), [])
             key = f"{status}_{label}"
             results[key] = {
                 'count': len(ages),
@@ -190,15 +340,17 @@ def query_smoking_stroke(data):
                 'median_age': _calculate_median(ages),
                 'modal_age': _calculate_mode(ages)
             } if ages else {'count': 0, 'message': 'No data'}
-    save_results_csv(results, "smoking_stroke.csv")
+    if save:
+        save_query_result('query_smoking_stroke', results, data)
     return results
 
 
-def query_residence_stroke(data):
+def query_residence_stroke(data, groups=None, save=True):
     """v. Age stats for Urban vs Rural stroke patients."""
     results = {}
     for residence in ['Urban', 'Rural']:
-        ages = _get_numeric_values(data, 'Age', {'Residence Type': residence, 'Stroke Occurrence': 1})
+        rows = _filter_data(data, {'Residence Type': residence, 'Stroke Occurrence': 1}, groups)
+        ages = _get_numeric_values(data, 'Age', rows)
         results[residence] = {
             'description': f"{residence} residents with stroke",
             'count': len(ages),
@@ -206,97 +358,126 @@ def query_residence_stroke(data):
             'median_age': _calculate_median(ages),
             'modal_age': _calculate_mode(ages)
         } if ages else {'count': 0, 'message': f'No data for {residence}'}
-    save_results_csv(results, "residence_stroke.csv")
+    if save:
+        save_query_result('query_residence_stroke', results, data)
     return results
 
 
-def query_dietary_habits_stroke(data):
+def query_dietary_habits_stroke(data, groups=None, save=True):
     """vi. Dietary habits distribution (stroke vs no stroke)."""
-    habits_stroke = [r.get('Dietary Habits') for r in _filter_data(data, {'Stroke Occurrence': 1}) if r.get('Dietary Habits')]
-    habits_no_stroke = [r.get('Dietary Habits') for r in _filter_data(data, {'Stroke Occurrence': 0}) if r.get('Dietary Habits')]
+    habits = data.get('Dietary Habits', [])
+    habits_stroke = map(habits.__getitem__, _filter_data(data, {'Stroke Occurrence': 1}, groups))
+    habits_no_stroke = map(habits.__getitem__, _filter_data(data, {'Stroke Occurrence': 0}, groups))
     result = {
         'description': "Dietary habits distribution",
-        'stroke': dict(Counter(habits_stroke)),
-        'no_stroke': dict(Counter(habits_no_stroke))
+        'stroke': dict(_count_values(habits_stroke)),
+        'no_stroke': dict(_count_values(habits_no_stroke))
     }
-    save_results_csv(result, "dietary_habits_stroke.csv")
+    if save:
+        save_query_result('query_dietary_habits_stroke', result, data)
     return result
 
 
-def query_hypertension_stroke_patients(data):
+def query_hypertension_stroke_patients(data, groups=None, save=True):
     """vii. Patients whose hypertension resulted in stroke."""
-    patients = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 1})
-    save_results_csv(patients, "hypertension_stroke_patients.csv")
+    patients = _select_records(data, _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 1}, groups))
+    if save:
+        save_query_result('query_hypertension_stroke_patients', patients, data)
     return patients
 
 
-def query_hypertension_stroke_comparison(data):
+def query_hypertension_stroke_comparison(data, groups=None, save=True):
     """viii. Patients with hypertension who had vs didn't have a stroke."""
-    stroke_patients = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 1})
-    no_stroke_patients = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 0})
-    combined = [{**p, 'Group': 'Stroke'} for p in stroke_patients] + [{**p, 'Group': 'No Stroke'} for p in no_stroke_patients]
-    save_results_csv(combined, "hypertension_stroke_comparison.csv")
-    return {'hypertension_led_to_stroke': stroke_patients, 'hypertension_did_not_lead_to_stroke': no_stroke_patients}
+    stroke_rows = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 1}, groups)
+    no_stroke_rows = _filter_data(data, {'Hypertension': 1, 'Stroke Occurrence': 0}, groups)
+    result = {'hypertension_led_to_stroke': _select_records(data, stroke_rows),
+              'hypertension_did_not_lead_to_stroke': _select_records(data, no_stroke_rows)}
+    if save:
+        save_query_result('query_hypertension_stroke_comparison', result, data)
+    return result
 
 
-def query_heart_disease_stroke_patients(data):
+def query_heart_disease_stroke_patients(data, groups=None, save=True):
     """ix. Patients with heart disease who had a stroke."""
-    patients = _filter_data(data, {'Heart Disease': 1, 'Stroke Occurrence': 1})
-    save_results_csv(patients, "heart_disease_stroke_patients.csv")
+    patients = _select_records(data, _filter_data(data, {'Heart Disease': 1, 'Stroke Occurrence': 1}, groups))
+    if save:
+        save_query_result('query_heart_disease_stroke_patients', patients, data)
     return patients
 
 
-def query_descriptive_statistics(data, feature_name, header):
+def save_descriptive_statistics(result, feature_name):
+    """Save a result of the descriptive statistics query (x) to its CSV file."""
+    save_results_csv(result, f"descriptive_stats_{feature_name}.csv")
+
+
+def query_descriptive_statistics(data, feature_name, save=True):
     """x. Descriptive stats for a given numeric feature."""
-    if feature_name not in header:
+    if feature_name not in data:
         return f"Error: Feature '{feature_name}' not found."
     numbers = _get_numeric_values(data, feature_name)
     if not numbers:
         result = f"Error: No valid numeric data for '{feature_name}'."
-        save_results_csv(result, f"descriptive_stats_{feature_name}.csv")
+        if save:
+            save_descriptive_statistics(result, feature_name)
         return result
+    # Sort once: min, max, median and percentiles are then read off by index
+    numbers.sort()
+    mean_val = sum(numbers) / len(numbers)
+    lower_quartile, upper_quartile = _calculate_percentiles(numbers, (25, 75), presorted=True)
     result = {
         'feature': feature_name,
         'count': len(numbers),
-        'mean': _calculate_mean(numbers),
-        'std_dev': _calculate_std_dev(numbers),
-        'min': round(min(numbers), 2),
-        '25%': _calculate_percentile(numbers, 25),
-        '50% (median)': _calculate_median(numbers),
-        '75%': _calculate_percentile(numbers, 75),
-        'max': round(max(numbers), 2)
+        'mean': round(mean_val, 2),
+        'std_dev': _calculate_std_dev(numbers, mean_val),
+        'min': round(numbers[0], 2),
+        '25%': lower_quartile,
+        '50% (median)': _calculate_median(numbers, presorted=True),
+        '75%': upper_quartile,
+        'max': round(numbers[-1], 2)
     }
-    save_results_csv(result, f"descriptive_stats_{feature_name}.csv")
+    if save:
+        save_descriptive_statistics(result, feature_name)
     return result
 
 
-def query_average_sleep_hours_stroke(data):
+def query_average_sleep_hours_stroke(data, groups=None, save=True):
     """xi. Sleep hours stats for stroke vs non-stroke patients."""
-    sleep_stroke = _get_numeric_values(data, 'Sleep Hours', {'Stroke Occurrence': 1})
-    sleep_no_stroke = _get_numeric_values(data, 'Sleep Hours', {'Stroke Occurrence': 0})
+    sleep_stroke = _get_numeric_values(data, 'Sleep Hours', _filter_data(data, {'Stroke Occurrence': 1}, groups))
+    sleep_no_stroke = _get_numeric_values(data, 'Sleep Hours', _filter_data(data, {'Stroke Occurrence': 0}, groups))
     result = {
-        'stroke': {
-            'count': len(sleep_stroke),
-            'mean': _calculate_mean(sleep_stroke),
-            'median': _calculate_median(sleep_stroke),
-            'mode': _calculate_mode(sleep_stroke),
-            'std_dev': _calculate_std_dev(sleep_stroke),
-            'min': round(min(sleep_stroke), 2) if sleep_stroke else None,
-            '25%': _calculate_percentile(sleep_stroke, 25),
-            '75%': _calculate_percentile(sleep_stroke, 75),
-            'max': round(max(sleep_stroke), 2) if sleep_stroke else None
-        },
-        'no_stroke': {
-            'count': len(sleep_no_stroke),
-            'mean': _calculate_mean(sleep_no_stroke),
-            'median': _calculate_median(sleep_no_stroke),
-            'mode': _calculate_mode(sleep_no_stroke),
-            'std_dev': _calculate_std_dev(sleep_no_stroke),
-            'min': round(min(sleep_no_stroke), 2) if sleep_no_stroke else None,
-            '25%': _calculate_percentile(sleep_no_stroke, 25),
-            '75%': _calculate_percentile(sleep_no_stroke, 75),
-            'max': round(max(sleep_no_stroke), 2) if sleep_no_stroke else None
-        }
+        'stroke': _summary_statistics(sleep_stroke),
+        'no_stroke': _summary_statistics(sleep_no_stroke)
     }
-    save_results_csv(result, "average_sleep_hours_stroke.csv")
-    return result
\ No newline at end of file
+    if save:
+        save_query_result('query_average_sleep_hours_stroke', result, data)
+    return result
+
+# --- Combined Execution ---
+
+def compute_all_queries(data):
+    """
+    Run queries i - ix and xi over a single grouping pass of the dataset.
+
+    Rows are bucketed once by GROUP_COLUMNS and every query resolves its
+    filters from those buckets instead of re-scanning the full columns.
+    The descriptive statistics query (x) takes a user-chosen feature and is
+    run on demand instead. Nothing is written to disk; pass a result to
+    save_query_result to save it.
+
+    Returns:
+        dict: Query result keyed by the query function name.
+    """
+    groups = _group_rows(data)
+    queries = (
+        query_smokers_hypertension_stroke,
+        query_heart_disease_stroke,
+        query_hypertension_gender_stroke,
+        query_smoking_stroke,
+        query_residence_stroke,
+        query_dietary_habits_stroke,
+        query_hypertension_stroke_patients,
+        query_hypertension_stroke_comparison,
+        query_heart_disease_stroke_patients,
+        query_average_sleep_hours_stroke,
+    )
+    return {query.__name__: query(data, groups, save=False) for query in queries}
@@ -5,23 +5,11 @@ Beautifully styled with consistent design, fonts, colors, and spacing.
 
 # ---------- Imports ----------
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 
 from dataset_module import load_data
-from query_module import (
-    query_smokers_hypertension_stroke,
-    query_heart_disease_stroke,
-    query_hypertension_gender_stroke,
-    query_smoking_stroke,
-    query_residence_stroke,
-    query_dietary_habits_stroke,
-    query_hypertension_stroke_patients,
-    query_hypertension_stroke_comparison,
-    query_heart_disease_stroke_patients,
-    query_descriptive_statistics,
-    query_average_sleep_hours_stroke
-)
+from query_module import (compute_all_queries, query_descriptive_statistics, save_descriptive_statistics,
+                          save_query_result)
 
 # ---------- Helper Functions ----------
 
@@ -44,18 +32,28 @@ def format_output(result):
         return f"### Found {len(result)} records."
     return str(result)
 
+def bin_counts(values, bins=30, value_range=None):
+    # Bin on the server so the chart ships `bins` counts instead of every raw value
+    low, high = value_range or (min(values), max(values))
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    centers = [low + width * (i + 0.5) for i in range(bins)]
+    return centers, counts
+
 def create_histogram(data, feature, title):
-    fig = px.histogram(
-        x=data,
-        nbins=30,
-        title=title,
-        labels={'x': feature, 'count': 'Count'},
-        template='plotly_dark',
-        color_discrete_sequence=['#00BFFF']
-    )
+    centers, counts = bin_counts(data)
+    fig = go.Figure(data=[
+        go.Bar(x=centers, y=counts, marker_color='#00BFFF')
+    ])
     fig.update_layout(
+        title=title,
         xaxis_title=feature,
         yaxis_title="Count",
+        template='plotly_dark',
         bargap=0.2
     )
     return fig
@@ -81,6 +79,136 @@ def custom_header(title):
     )
     st.write("---")
 
+# ---------- Cached Data ----------
+# Streamlit reruns the whole script on every widget change; these keep the
+# parsed dataset and query results in memory between reruns.
+
+@st.cache_resource(show_spinner=False)
+def load_dataset(filepath):
+    # cache_resource hands back the same columns each rerun instead of unpickling a copy;
+    # the on-disk cache spares re-parsing the CSV when the app restarts
+    return load_data(filepath, use_cache=True)
+
+@st.cache_data(show_spinner="Running queries...")
+def all_query_results(filepath, _data):
+    # Keyed on filepath only; the leading underscore stops Streamlit hashing the dataset
+    return compute_all_queries(_data)
+
+@st.cache_data(show_spinner=False)
+def descriptive_statistics_result(filepath, feature, _data):
+    # Saving is left to the caller so the CSV is rewritten every time the result is shown
+    return query_descriptive_statistics(_data, feature, save=False)
+
+# ---------- Query Figures ----------
+# Sidebar label -> (key in compute_all_queries results, section subheader)
+QUERY_VIEWS = {
+    "Smokers with Hypertension (Stroke)": ('query_smokers_hypertension_stroke', "🚬 Smokers with Hypertension (Stroke)"),
+    "Heart Disease with Stroke": ('query_heart_disease_stroke', "❤️ Heart Disease with Stroke"),
+    "Hypertension by Gender (Stroke vs No Stroke)": ('query_hypertension_gender_stroke', "🧍‍♂️🧍‍♀️ Hypertension by Gender"),
+    "Smoking Habits (Stroke vs No Stroke)": ('query_smoking_stroke', "🚬 Smoking Habits (Stroke vs No Stroke)"),
+    "Urban vs Rural (Stroke)": ('query_residence_stroke', "🏙️🏡 Urban vs Rural Stroke"),
+    "Dietary Habits (Stroke vs No Stroke)": ('query_dietary_habits_stroke', "🥗 Dietary Habits"),
+    "Hypertension Patients (Stroke)": ('query_hypertension_stroke_patients', "💉 Hypertension Patients (Stroke)"),
+    "Hypertension Patients (Stroke vs No Stroke)": ('query_hypertension_stroke_comparison', "💉 Hypertension (Stroke vs No Stroke)"),
+    "Heart Disease Patients (Stroke)": ('query_heart_disease_stroke_patients', "❤️ Heart Disease (Stroke Patients)"),
+    "Sleep Hours (Stroke vs No Stroke)": ('query_average_sleep_hours_stroke', "😴 Sleep Hours (Stroke vs No Stroke)"),
+}
+
+def numeric_ages(records):
+    return [r['Age'] for r in records if isinstance(r['Age'], (int, float))]
+
+@st.cache_data(show_spinner=False)
+def query_figure(query, filepath, _results):
+    # Figures only depend on the cached results, so each is built once per query and dataset
+    result = _results[QUERY_VIEWS[query][0]]
+
+    if query == "Smokers with Hypertension (Stroke)":
+        if 'average_age' in result:
+            return create_bar_chart(
+                ['Average Age', 'Median Age'],
+                [result['average_age'], result['median_age']],
+                "Age Statistics",
+                "Statistic", "Age"
+            )
+
+    elif query == "Heart Disease with Stroke":
+        if 'average_age' in result:
+            return create_bar_chart(
+                ['Average Age', 'Average Glucose Level'],
+                [result['average_age'], result['average_glucose_level']],
+                "Heart Disease Stroke Statistics",
+                "Statistic", "Value"
+            )
+
+    elif query in ("Hypertension by Gender (Stroke vs No Stroke)",
+                   "Smoking Habits (Stroke vs No Stroke)",
+                   "Urban vs Rural (Stroke)"):
+        title, x_label = {
+            "Hypertension by Gender (Stroke vs No Stroke)": ("Average Age by Gender & Stroke Status", "Group"),
+            "Smoking Habits (Stroke vs No Stroke)": ("Smoking Status by Stroke Outcome", "Group"),
+            "Urban vs Rural (Stroke)": ("Average Age: Urban vs Rural", "Residence Type"),
+        }[query]
+        categories, values = zip(*[
+            (k, v['average_age']) for k, v in result.items() if 'average_age' in v
+        ])
+        return create_bar_chart(categories, values, title, x_label, "Average Age")
+
+    elif query == "Dietary Habits (Stroke vs No Stroke)":
+        if 'stroke' in result:
+            return create_bar_chart(
+                list(result['stroke'].keys()),
+                list(result['stroke'].values()),
+                "Dietary Habits of Stroke Patients",
+                "Habit", "Count"
+            )
+
+    elif query == "Hypertension Patients (Stroke)":
+        ages = numeric_ages(result)
+        if ages:
+            return create_histogram(ages, "Age", "Age Distribution: Hypertension with Stroke")
+
+    elif query == "Hypertension Patients (Stroke vs No Stroke)":
+        groups = {
+            "Stroke": numeric_ages(result['hypertension_led_to_stroke']),
+            "No Stroke": numeric_ages(result['hypertension_did_not_lead_to_stroke'])
+        }
+        all_ages = [age for ages in groups.values() for age in ages]
+        fig = go.Figure()
+        for name, ages in groups.items():
+            if ages:
+                # Shared bin range so the two overlaid distributions line up
+                centers, counts = bin_counts(ages, value_range=(min(all_ages), max(all_ages)))
+                fig.add_trace(go.Bar(x=centers, y=counts, name=name, opacity=0.6))
+        fig.update_layout(
+            barmode='overlay',
+            title="Age Distribution: Hypertension (Stroke vs No Stroke)",
+            template='plotly_dark'
+        )
+        return fig
+
+    elif query == "Heart Disease Patients (Stroke)":
+        ages = numeric_ages(result)
+        if ages:
+            return create_histogram(ages, "Age", "Age Distribution: Heart Disease with Stroke")
+
+    elif query == "Sleep Hours (Stroke vs No Stroke)":
+        if 'stroke_patients' in result and 'non_stroke_patients' in result:
+            return create_bar_chart(
+                ['Stroke Patients', 'Non-Stroke Patients'],
+                [result['stroke_patients']['mean'], result['non_stroke_patients']['mean']],
+                "Average Sleep Hours",
+                "Group", "Hours"
+            )
+
+    return None
+
+@st.cache_data(show_spinner=False)
+def feature_figure(filepath, feature, _data):
+    numbers = [value for value in _data[feature] if isinstance(value, (int, float))]
+    if numbers:
+        return create_histogram(numbers, feature, f"Distribution of {feature}")
+    return None
+
 # ---------- Main App ----------
 
 def run_streamlit_app(filepath):
@@ -95,11 +223,12 @@ def run_streamlit_app(filepath):
 
     with st.spinner('Loading data...'):
         try:
-            data, header = load_data(filepath)
-            if not data:
+            data, header = load_dataset(filepath)
+            record_count = len(data[header[0]]) if data else 0
+            if not record_count:
                 st.error("❌ No data loaded. Please check the file path.")
                 return
-            st.success(f"✅ Dataset loaded successfully! {len(data)} records available.")
+            st.success(f"✅ Dataset loaded successfully! {record_count} records available.")
         except Exception as e:
             st.error(f"❌ Failed to load dataset: {e}")
             return
@@ -134,149 +263,26 @@ def run_streamlit_app(filepath):
 
     # Handle each query
     try:
-        if query == "Smokers with Hypertension (Stroke)":
-            result = query_smokers_hypertension_stroke(data)
-            st.subheader("🚬 Smokers with Hypertension (Stroke)")
-            st.markdown(format_output(result))
-            if 'average_age' in result:
-                fig = create_bar_chart(
-                    ['Average Age', 'Median Age'],
-                    [result['average_age'], result['median_age']],
-                    "Age Statistics",
-                    "Statistic", "Age"
-                )
-                st.plotly_chart(fig)
-
-        elif query == "Heart Disease with Stroke":
-            result = query_heart_disease_stroke(data)
-            st.subheader("❤️ Heart Disease with Stroke")
-            st.markdown(format_output(result))
-            if 'average_age' in result:
-                fig = create_bar_chart(
-                    ['Average Age', 'Average Glucose Level'],
-                    [result['average_age'], result['average_glucose_level']],
-                    "Heart Disease Stroke Statistics",
-                    "Statistic", "Value"
-                )
-                st.plotly_chart(fig)
-
-        elif query == "Hypertension by Gender (Stroke vs No Stroke)":
-            result = query_hypertension_gender_stroke(data)
-            st.subheader("🧍‍♂️🧍‍♀️ Hypertension by Gender")
-            st.markdown(format_output(result))
-            categories, values = zip(*[
-                (k, v['average_age']) for k, v in result.items() if 'average_age' in v
-            ])
-            fig = create_bar_chart(
-                categories, values,
-                "Average Age by Gender & Stroke Status",
-                "Group", "Average Age"
-            )
-            st.plotly_chart(fig)
-
-        elif query == "Smoking Habits (Stroke vs No Stroke)":
-            result = query_smoking_stroke(data)
-            st.subheader("🚬 Smoking Habits (Stroke vs No Stroke)")
-            st.markdown(format_output(result))
-            categories, values = zip(*[
-                (k, v['average_age']) for k, v in result.items() if 'average_age' in v
-            ])
-            fig = create_bar_chart(
-                categories, values,
-                "Smoking Status by Stroke Outcome",
-                "Group", "Average Age"
-            )
-            st.plotly_chart(fig)
-
-        elif query == "Urban vs Rural (Stroke)":
-            result = query_residence_stroke(data)
-            st.subheader("🏙️🏡 Urban vs Rural Stroke")
-            st.markdown(format_output(result))
-            categories, values = zip(*[
-                (k, v['average_age']) for k, v in result.items() if 'average_age' in v
-            ])
-            fig = create_bar_chart(
-                categories, values,
-                "Average Age: Urban vs Rural",
-                "Residence Type", "Average Age"
-            )
-            st.plotly_chart(fig)
-
-        elif query == "Dietary Habits (Stroke vs No Stroke)":
-            result = query_dietary_habits_stroke(data)
-            st.subheader("🥗 Dietary Habits")
-            st.markdown(format_output(result))
-            if 'stroke' in result:
-                fig = create_bar_chart(
-                    list(result['stroke'].keys()),
-                    list(result['stroke'].values()),
-                    "Dietary Habits of Stroke Patients",
-                    "Habit", "Count"
-                )
-                st.plotly_chart(fig)
-
-        elif query == "Hypertension Patients (Stroke)":
-            result = query_hypertension_stroke_patients(data)
-            st.subheader("💉 Hypertension Patients (Stroke)")
-            st.markdown(format_output(result))
-            ages = [r['Age'] for r in result if isinstance(r['Age'], (int, float))]
-            if ages:
-                fig = create_histogram(ages, "Age", "Age Distribution: Hypertension with Stroke")
-                st.plotly_chart(fig)
-
-        elif query == "Hypertension Patients (Stroke vs No Stroke)":
-            result = query_hypertension_stroke_comparison(data)
-            st.subheader("💉 Hypertension (Stroke vs No Stroke)")
-            st.markdown(format_output(result))
-            fig = go.Figure()
-            fig.add_trace(go.Histogram(
-                x=[r['Age'] for r in result['hypertension_led_to_stroke']],
-                name="Stroke",
-                opacity=0.6
-            ))
-            fig.add_trace(go.Histogram(
-                x=[r['Age'] for r in result['hypertension_did_not_lead_to_stroke']],
-                name="No Stroke",
-                opacity=0.6
-            ))
-            fig.update_layout(
-                barmode='overlay',
-                title="Age Distribution: Hypertension (Stroke vs No Stroke)",
-                template='plotly_dark'
-            )
-            st.plotly_chart(fig)
-
-        elif query == "Heart Disease Patients (Stroke)":
-            result = query_heart_disease_stroke_patients(data)
-            st.subheader("❤️ Heart Disease (Stroke Patients)")
-            st.markdown(format_output(result))
-            ages = [r['Age'] for r in result if isinstance(r['Age'], (int, float))]
-            if ages:
-                fig = create_histogram(ages, "Age", "Age Distribution: Heart Disease with Stroke")
-                st.plotly_chart(fig)
-
-        elif query == "Descriptive Statistics":
+        if query == "Descriptive Statistics":
             st.subheader("📈 Descriptive Statistics")
             feature = st.text_input("🔎 Enter a feature name:", key="feature_input")
             if feature:
-                result = query_descriptive_statistics(data, feature, header)
+                result = descriptive_statistics_result(filepath, feature, data)
+                if feature in data:
+                    save_descriptive_statistics(result, feature)
                 st.markdown(format_output(result))
-                numbers = [record[feature] for record in data if isinstance(record[feature], (int, float))]
-                if numbers:
-                    fig = create_histogram(numbers, feature, f"Distribution of {feature}")
+                fig = feature_figure(filepath, feature, data)
+                if fig is not None:
                     st.plotly_chart(fig)
-
-        elif query == "Sleep Hours (Stroke vs No Stroke)":
-            result = query_average_sleep_hours_stroke(data)
-            st.subheader("😴 Sleep Hours (Stroke vs No Stroke)")
-            st.markdown(format_output(result))
-            if 'stroke_patients' in result and 'non_stroke_patients' in result:
-                fig = create_bar_chart(
-                    ['Stroke Patients', 'Non-Stroke Patients'],
-                    [result['stroke_patients']['mean'], result['non_stroke_patients']['mean']],
-                    "Average Sleep Hours",
-                    "Group", "Hours"
-                )
+        else:
+            results = all_query_results(filepath, data)
+            result_key, subheader = QUERY_VIEWS[query]
+            # Only the selected query's CSV is written, each time it is shown
+            save_query_result(result_key, results[result_key], data)
+            st.subheader(subheader)
+            st.markdown(format_output(results[result_key]))
+            fig = query_figure(query, filepath, results)
+            if fig is not None:
                 st.plotly_chart(fig)
 
     except Exception as e:
@@ -63,13 +63,19 @@ class EDA:
         # Apply SMOTE for multi-class imbalance
         if class_counts.min() / class_counts.max() < 0.5:  # Threshold for imbalance
             print(f"Applying SMOTE to balance {target_column} classes.")
-            X = self.data.drop(columns=[target_column])
+            # float32 halves the memory SMOTE's nearest-neighbour search works over
+            X = self.data.drop(columns=[target_column]).astype(np.float32)
             y = self.data[target_column]
             try:
                 smote = SMOTE(sampling_strategy='auto', random_state=42)  # Balance all classes evenly
                 X_balanced, y_balanced = smote.fit_resample(X, y)
-                balanced_data = pd.concat([pd.DataFrame(X_balanced, columns=X.columns), 
-                                          pd.Series(y_balanced, name=target_column)], axis=1)
+                # SMOTE returns the original rows first: keep those from self.data untouched and append
+                # only the synthetic rows, cast back to the original dtypes so encoded categories stay integers
+                columns = [*X.columns, target_column]
+                synthetic = pd.DataFrame(X_balanced, columns=X.columns).iloc[len(X):]
+                synthetic = synthetic.astype(self.data.dtypes[X.columns])
+                synthetic[target_column] = np.asarray(y_balanced)[len(X):]
+                balanced_data = pd.concat([self.data[columns], synthetic[columns]], ignore_index=True)
                 print(f"Balanced class distribution for {target_column} (after SMOTE):\n{balanced_data[target_column].value_counts()}")
                 return balanced_data
             except ValueError as e:
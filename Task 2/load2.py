@@ -1,6 +1,39 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
+
+# Categorical columns, excluded from scaling
+_CATEGORICAL = frozenset([
+    'Chronic Stress', 'Physical Activity', 'Income Level', 'Stroke Occurrence',
+    'Hypertension', 'Heart Disease', 'Ever Married', 'Work Type',
+    'Residence Type', 'Smoking Status', 'Dietary Habits',
+    'Alcohol Consumption', 'Family History of Stroke',
+    'Education Level', 'Region', 'Cardiovascular_Condition',
+    'BMI_Category', 'High_Glucose_Risk'])
+
+# Engineered features: (new column, input columns, function of the inputs' NumPy arrays).
+# A feature is skipped when any of its input columns is missing.
+_FEATURES = [
+    # Binary feature for cardiovascular conditions
+    # (0/1 flags, so the OR runs on int8 copies; astype is a no-op when they are already int8)
+    ('Cardiovascular_Condition', ('Hypertension', 'Heart Disease'),
+     lambda hypertension, heart_disease: np.bitwise_or(hypertension.astype(np.int8, copy=False),
+                                                       heart_disease.astype(np.int8, copy=False))),
+    # Categorize BMI into standard ranges (0=Underweight, 1=Normal, 2=Overweight, 3=Obese);
+    # labels=False yields the bin codes directly, without building a Categorical to re-encode
+    ('BMI_Category', ('BMI',),
+     lambda bmi: pd.cut(bmi, bins=[0, 18.5, 25, 30, np.inf], labels=False, include_lowest=True).astype(np.int8)),
+    # Threshold for high glucose risk
+    ('High_Glucose_Risk', ('Average Glucose Level',),
+     lambda glucose: (glucose > 200).astype(np.int8)),
+    # Interaction feature: Age * Physical Activity
+    ('Activity_Age_Interaction', ('Age', 'Physical Activity'),
+     lambda age, activity: age * activity),
+    # Ratio feature: Sleep Hours / Physical Activity
+    ('Sleep_Activity_Ratio', ('Sleep Hours', 'Physical Activity'),
+     lambda sleep, activity: sleep / (activity + 1.0)),  # Avoid division by zero
+]
 
 class DatasetLoader:
     """Class to load, clean, and preprocess the stroke dataset."""
@@ -8,6 +41,7 @@ class DatasetLoader:
         self.file_path = file_path
         self.data = None
         self.scaler = StandardScaler()
+        self.feature_names_ = None
 
     def load_data(self):
         """Load the dataset from a CSV file."""
@@ -25,41 +59,30 @@ class DatasetLoader:
             print("Error: Data not loaded.")
             return None
 
-        # Handle missing numerical values with median
+        # Handle missing numerical values with median (one aggregation and assignment for all columns)
         numerical_cols = self.data.select_dtypes(include=['float64', 'int64']).columns
-        for col in numerical_cols:
-            self.data[col] = self.data[col].fillna(self.data[col].median())
+        self.data[numerical_cols] = self.data[numerical_cols].fillna(self.data[numerical_cols].median())
 
         # Handle missing categorical values with mode
         categorical_cols = self.data.select_dtypes(include=['object']).columns
-        for col in categorical_cols:
-            self.data[col] = self.data[col].fillna(self.data[col].mode()[0])
+        if len(categorical_cols) > 0:
+            self.data[categorical_cols] = self.data[categorical_cols].fillna(self.data[categorical_cols].mode().iloc[0])
 
-        # Encode categorical variables
-        le = LabelEncoder()
-        for col in categorical_cols:
-            self.data[col] = le.fit_transform(self.data[col])
+            # Encode categorical variables; category codes follow the same sorted order as LabelEncoder
+            self.data[categorical_cols] = self.data[categorical_cols].apply(
+                lambda col: col.astype('category').cat.codes.astype('int64'))
 
         # Feature engineering
         self.compute_features()
 
-        # Define categorical columns to exclude from scaling
-        categorical_cols = ['Chronic Stress', 'Physical Activity', 'Income Level', 'Stroke Occurrence', 
-                           'Hypertension', 'Heart Disease', 'Ever Married', 'Work Type', 
-                           'Residence Type', 'Smoking Status', 'Dietary Habits', 
-                           'Alcohol Consumption', 'Family History of Stroke', 
-                           'Education Level', 'Region', 'Cardiovascular_Condition', 
-                           'BMI_Category', 'High_Glucose_Risk']
-
-        # Ensure categorical columns are integers
-        for col in categorical_cols:
-            if col in self.data.columns:
-                self.data[col] = self.data[col].astype('int64')
+        # Ensure categorical columns are integers (int8 is enough for these small code sets)
+        present_categorical = self.data.columns[self.data.columns.isin(_CATEGORICAL)]
+        self.data = self.data.astype({col: np.int8 for col in present_categorical})
 
         # Scale only non-categorical numerical columns
-        numerical_cols = [col for col in self.data.select_dtypes(include=['float64', 'int64']).columns 
-                         if col not in categorical_cols]
-        if numerical_cols:
+        numerical_cols = self.data.select_dtypes(include=['float64', 'int64']).columns
+        numerical_cols = numerical_cols[~numerical_cols.isin(_CATEGORICAL)]
+        if len(numerical_cols) > 0:
             self.data[numerical_cols] = self.scaler.fit_transform(self.data[numerical_cols])
 
         print("Data cleaned, features computed, and scaled (excluding categorical columns).")
@@ -71,29 +94,16 @@ class DatasetLoader:
             print("Error: Data not loaded.")
             return None
 
-        # Create a binary feature for cardiovascular conditions
-        if 'Hypertension' in self.data.columns and 'Heart Disease' in self.data.columns:
-            self.data['Cardiovascular_Condition'] = (self.data['Hypertension'] | self.data['Heart Disease']).astype(int)
-
-        # Categorize BMI into standard ranges
-        if 'BMI' in self.data.columns:
-            self.data['BMI_Category'] = pd.cut(self.data['BMI'], 
-                                              bins=[0, 18.5, 25, 30, float('inf')], 
-                                              labels=['Underweight', 'Normal', 'Overweight', 'Obese'])
-            le = LabelEncoder()
-            self.data['BMI_Category'] = le.fit_transform(self.data['BMI_Category'])
-
-        # Threshold for high glucose risk
-        if 'Average Glucose Level' in self.data.columns:
-            self.data['High_Glucose_Risk'] = (self.data['Average Glucose Level'] > 200).astype(int)
-
-        # Interaction feature: Age * Physical Activity
-        if 'Age' in self.data.columns and 'Physical Activity' in self.data.columns:
-            self.data['Activity_Age_Interaction'] = self.data['Age'] * self.data['Physical Activity']
+        # Features are computed on the raw NumPy arrays: every column comes from the
+        # same frame, so pandas' index alignment would only add an extra pass
+        present = set(self.data.columns)
+        new = {name: compute(*(self.data[col].to_numpy() for col in inputs))
+               for name, inputs, compute in _FEATURES if present.issuperset(inputs)}
 
-        # Ratio feature: Sleep Hours / Physical Activity
-        if 'Sleep Hours' in self.data.columns and 'Physical Activity' in self.data.columns:
-            self.data['Sleep_Activity_Ratio'] = self.data['Sleep Hours'] / (self.data['Physical Activity'] + 1)  # Avoid division by zero
+        # Append all new features in one concat rather than growing the frame column by column
+        if new:
+            features = pd.DataFrame(new, index=self.data.index)
+            self.data = pd.concat([self.data.drop(columns=features.columns, errors='ignore'), features], axis=1)
 
     def split_data(self, target_column, test_size=0.2, random_state=42):
         """Split the dataset into training and test sets, avoiding data leakage."""
@@ -108,5 +118,9 @@ class DatasetLoader:
 
         X = self.data.drop(columns=exclude_cols)
         y = self.data[target_column]
-        return train_test_split(X, y, test_size=test_size, random_state=random_state)
+        self.feature_names_ = X.columns.tolist()
+        # float32 arrays go straight into the estimators; train_test_split's row indexing already
+        # yields fresh C-contiguous splits, so no extra contiguous copy is made here
+        return train_test_split(X.to_numpy(dtype=np.float32), y.to_numpy(), test_size=test_size,
+                                random_state=random_state)
     
\ No newline at end of file
@@ -1,56 +1,112 @@
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+from sklearn.base import clone
 from sklearn.naive_bayes import GaussianNB
 from sklearn.ensemble import RandomForestClassifier
 from xgboost import XGBClassifier
-from sklearn.metrics import confusion_matrix, precision_score, recall_score, accuracy_score
+from joblib import Parallel, delayed
 import os
+from pathlib import Path
+
+# Default output directory for plots, created once when the module is imported
+_PLOTS_DIR = Path('plots')
+_PLOTS_DIR.mkdir(exist_ok=True)
+
+def _fit_model(model, X_train, y_train):
+    """Fit a fresh clone of an estimator (module-level so joblib workers can run it)."""
+    # Cloning keeps each cached fit independent of later fits of the same configured estimator
+    return clone(model).fit(X_train, y_train)
+
+def _evaluate(y_true, y_pred):
+    """Accuracy, weighted precision/recall and confusion matrix, all derived from one confusion matrix."""
+    # Same label set and ordering as sklearn's confusion_matrix
+    labels = np.union1d(y_true, y_pred)
+    k = len(labels)
+    cells = np.searchsorted(labels, y_true) * k + np.searchsorted(labels, y_pred)
+    cm = np.bincount(cells, minlength=k * k).reshape(k, k)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    # Classes never predicted (or never present) score 0, as with zero_division=0
+    precision = tp / np.maximum(cm.sum(axis=0), 1)
+    recall = tp / np.maximum(support, 1)
+    return {
+        'Accuracy': tp.sum() / cm.sum(),
+        'Precision': (precision * support).sum() / support.sum(),
+        'Recall': (recall * support).sum() / support.sum(),
+        'Confusion Matrix': cm
+    }
 
 class MLModels:
     """Class for training and evaluating machine learning models."""
-    def __init__(self, X_train, X_test, y_train, y_test):
-        """Initialize with training and test data."""
+    def __init__(self, X_train, X_test, y_train, y_test, use_gpu=False):
+        """Initialize with training and test data; use_gpu trains XGBoost on a CUDA device."""
         self.X_train = X_train
         self.X_test = X_test
         self.y_train = y_train
         self.y_test = y_test
+        # The models are fitted side by side, so the threaded ones split the cores between them
+        threads_per_model = max(1, (os.cpu_count() or 1) // 3)
+        # The device is only passed when asked for, so CPU runs keep XGBoost's default arguments
+        gpu_options = {'device': 'cuda'} if use_gpu else {}
         self.models = {
             'Naive Bayes': GaussianNB(var_smoothing=1e-8),  # Small smoothing for stability
-            'Random Forest': RandomForestClassifier(max_depth=10, min_samples_split=10, random_state=42),
-            'XGBoost': XGBClassifier(max_depth=6, min_child_weight=5, eval_metric='mlogloss', random_state=42)
+            'Random Forest': RandomForestClassifier(max_depth=10, min_samples_split=10, random_state=42,
+                                                    n_jobs=threads_per_model),
+            # Histogram split finding: features are bucketed once rather than scanned exactly per split
+            'XGBoost': XGBClassifier(max_depth=6, min_child_weight=5, eval_metric='mlogloss', random_state=42,
+                                     tree_method='hist', n_jobs=threads_per_model, **gpu_options)
         }
         self.results = {}
-        if not os.path.exists('plots'):
-            os.makedirs('plots')
+        # Model name -> (X_train, y_train, fitted estimator) for that model's latest fit only
+        self._fit_cache = {}
 
-    def train_and_evaluate(self, target_name, save_path='plots/'):
+    def train_and_evaluate(self, target_name, save_path=_PLOTS_DIR):
         """Train and evaluate models for a given target."""
         self.results[target_name] = {}
+        # Train the models in parallel worker processes, reusing earlier fits on the same training data
+        fitted = {}
+        for model_name in self.models:
+            cached = self._fit_cache.get(model_name)
+            if cached is not None and cached[0] is self.X_train and cached[1] is self.y_train:
+                fitted[model_name] = cached[2]
+        pending = [name for name in self.models if name not in fitted]
+        if pending:
+            models = Parallel(n_jobs=len(pending), backend='loky')(
+                delayed(_fit_model)(self.models[name], self.X_train, self.y_train) for name in pending)
+            for model_name, model in zip(pending, models):
+                self._fit_cache[model_name] = (self.X_train, self.y_train, model)
+                fitted[model_name] = model
+
+        # Fits come back from the workers as copies; expose them through self.models as before
+        self.models.update(fitted)
+
         for model_name, model in self.models.items():
-            # Train the model
-            model.fit(self.X_train, self.y_train)
             # Predict
             y_pred = model.predict(self.X_test)
             # Evaluate
-            self.results[target_name][model_name] = {
-                'Accuracy': accuracy_score(self.y_test, y_pred),
-                'Precision': precision_score(self.y_test, y_pred, average='weighted', zero_division=0),
-                'Recall': recall_score(self.y_test, y_pred, average='weighted', zero_division=0),
-                'Confusion Matrix': confusion_matrix(self.y_test, y_pred)
-            }
-            # Plot confusion matrix
-            plt.figure(figsize=(6, 4))
-            sns.heatmap(self.results[target_name][model_name]['Confusion Matrix'], annot=True, fmt='d', cmap='Blues')
-            plt.title(f'Confusion Matrix for {model_name} - {target_name}', fontsize=12)
-            plt.xlabel('Predicted', fontsize=10)
-            plt.ylabel('Actual', fontsize=10)
-            confusion_path = f'{save_path}{model_name}_{target_name}_confusion_matrix.png'
-            plt.savefig(confusion_path)
-            print(f"Confusion matrix saved at: {confusion_path}")
-            plt.close()
+            self.results[target_name][model_name] = _evaluate(np.asarray(self.y_test), y_pred)
+
+        # Plot all confusion matrices side by side in a single figure
+        fig, axes = plt.subplots(1, len(self.models), figsize=(6 * len(self.models), 4), squeeze=False)
+        for ax, (model_name, result) in zip(axes[0], self.results[target_name].items()):
+            cm = result['Confusion Matrix']
+            im = ax.imshow(cm, cmap='Blues')
+            fig.colorbar(im, ax=ax)
+            for (i, j), value in np.ndenumerate(cm):
+                # Light text on the dark end of the colormap, as sns.heatmap does
+                ax.text(j, i, str(value), ha='center', va='center',
+                        color='white' if im.norm(value) > 0.5 else 'black')
+            ax.set_title(f'Confusion Matrix for {model_name} - {target_name}', fontsize=12)
+            ax.set_xlabel('Predicted', fontsize=10)
+            ax.set_ylabel('Actual', fontsize=10)
+        fig.tight_layout()
+        confusion_path = Path(save_path) / f'{target_name}_confusion_all.png'
+        fig.savefig(confusion_path, dpi=72)
+        print(f"Confusion matrices saved at: {confusion_path}")
+        plt.close(fig)
 
-    def plot_model_comparison(self, target_name, save_path='plots/'):
+    def plot_model_comparison(self, target_name, save_path=_PLOTS_DIR):
         """Plot comparison of model performance."""
         metrics = ['Accuracy', 'Precision', 'Recall']
         data = pd.DataFrame({
@@ -66,8 +122,8 @@ class MLModels:
         plt.xticks(rotation=45)
         plt.legend(loc='best')
         plt.tight_layout()
-        comparison_path = f'{save_path}{target_name}_model_comparison.png'
-        plt.savefig(comparison_path)
+        comparison_path = Path(save_path) / f'{target_name}_model_comparison.png'
+        plt.savefig(comparison_path, dpi=72)
         print(f"Model comparison plot saved at: {comparison_path}")
         plt.close()
         return data